@@ -1 +1,74 @@
+"""
+OpenSearch client library.
+
+The public API is re-exported here, but resolved lazily: importing
+``opynsearch`` only loads the submodule providing a name on first attribute
+access, so that e.g. working with :class:`Description` objects does not pull
+in ``lxml``, ``pygml`` or ``iso8601``.
+"""
+from importlib import import_module
+from typing import TYPE_CHECKING, Any, Dict, List
+
 __version__ = '0.0.1'
+
+if TYPE_CHECKING:  # pragma: no cover
+    from .atom import parse_atom_feed, parse_atom_feeds  # noqa: F401
+    from .description import (  # noqa: F401
+        Description, HttpMethod, Image, Option, Parameter, Query,
+        SyndicationRight, Url
+    )
+    from .osdd11 import encode_osdd11, parse_osdd11  # noqa: F401
+    from .harvest import HarvestState, harvest_delta  # noqa: F401
+    from .paging import PageSizeStore, PageSizeTuner, paginate  # noqa: F401
+    from .policy import HedgePolicy, RequestPolicy, RetryPolicy  # noqa: F401
+    from .result import SearchResult, SearchResultItem, SearchResultPage  # noqa: F401
+    from .scheduler import HostLimits, RateLimit, Scheduler  # noqa: F401
+    from .utils import InternTable  # noqa: F401
+
+
+_LAZY_ATTRIBUTES: Dict[str, str] = {
+    "parse_atom_feed": ".atom",
+    "parse_atom_feeds": ".atom",
+    "Description": ".description",
+    "HttpMethod": ".description",
+    "Image": ".description",
+    "Option": ".description",
+    "Parameter": ".description",
+    "Query": ".description",
+    "SyndicationRight": ".description",
+    "Url": ".description",
+    "encode_osdd11": ".osdd11",
+    "parse_osdd11": ".osdd11",
+    "HarvestState": ".harvest",
+    "harvest_delta": ".harvest",
+    "PageSizeStore": ".paging",
+    "PageSizeTuner": ".paging",
+    "paginate": ".paging",
+    "HedgePolicy": ".policy",
+    "RequestPolicy": ".policy",
+    "RetryPolicy": ".policy",
+    "SearchResult": ".result",
+    "SearchResultItem": ".result",
+    "SearchResultPage": ".result",
+    "HostLimits": ".scheduler",
+    "RateLimit": ".scheduler",
+    "Scheduler": ".scheduler",
+    "InternTable": ".utils",
+}
+
+__all__ = ["__version__", *_LAZY_ATTRIBUTES]
+
+
+def __getattr__(name: str) -> Any:
+    try:
+        module_name = _LAZY_ATTRIBUTES[name]
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    value = getattr(import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> List[str]:
+    # only the public API, not the helpers imported above
+    return sorted({*__all__, *(name for name in globals() if name.startswith("__"))})
@@ -1,16 +1,16 @@
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import BinaryIO, Tuple, Union
-
-from pygml.georss import parse_georss, NAMESPACE as NS_GEORSS
+from typing import Any, Callable, Iterable, List, Optional, Sequence, Tuple, Union
 
 from .osdd11 import NS_OSDD
 from .result import SearchResultItem, SearchResultPage
-from .utils import parse_datetime, unwrap
-from .xml import parse_xml, unwrap_element
+from .utils import InternTable, parse_datetime, unwrap
+from .xml import Element, XmlSource, parse_xml, unwrap_element
 
 
 NS_ATOM = "http://www.w3.org/2005/Atom"
 NS_DC = "http://purl.org/dc/elements/1.1/"
+NS_GEORSS = "http://www.georss.org/georss"
 
 NAMESPACES = {
     "atom": NS_ATOM,
@@ -27,8 +27,34 @@ def parse_temporal(value: str) -> Union[datetime, Tuple[datetime, datetime]]:
     return parse_datetime(value)
 
 
-def parse_atom_feed(source: Union[BinaryIO, bytes]) -> SearchResultPage:
-    root = parse_xml(source, (NS_ATOM, "feed"))
+def parse_envelope(element: Element) -> Any:
+    # pygml is comparatively expensive to import, so defer it to first use
+    from pygml.georss import parse_georss
+
+    return parse_georss(element)
+
+
+def identity(value: Optional[str]) -> Optional[str]:
+    return value
+
+
+def parse_atom_feed(source: XmlSource, intern: Optional[InternTable] = None,
+                    huge_tree: bool = False) -> SearchResultPage:
+    """
+    Parses an Atom feed into a :class:`SearchResultPage`. Passing an
+    ``intern`` table shares the values of the commonly repeated item fields
+    (subjects, creator, contributors, language, rights) between the items and
+    across all pages parsed with the same table. See :func:`parse_xml` for the
+    accepted sources and ``huge_tree``.
+    """
+    root = parse_xml(source, (NS_ATOM, "feed"), huge_tree=huge_tree)
+    value: Callable[[Optional[str]], Optional[str]]
+    values: Callable[[Iterable[str]], Sequence[str]]
+    if intern is not None:
+        value, values = intern, intern.values
+    else:
+        # keep the values as they are and build plain lists
+        value, values = identity, list
     return SearchResultPage(
         title=root.findtext("atom:title", namespaces=NAMESPACES),
         id=root.findtext("atom:id", namespaces=NAMESPACES),
@@ -41,16 +67,16 @@ def parse_atom_feed(source: Union[BinaryIO, bytes]) -> SearchResultPage:
                 title=entry.findtext("atom:title", namespaces=NAMESPACES),
                 id=entry.findtext("atom:id", namespaces=NAMESPACES),
                 identifier=entry.findtext("dc:identifier", namespaces=NAMESPACES),
-                creator=entry.findtext("atom:creator", namespaces=NAMESPACES),
-                subjects=[
+                creator=value(entry.findtext("atom:creator", namespaces=NAMESPACES)),
+                subjects=values(
                     category.attrib["term"]
                     for category in entry.findall("atom:category", NAMESPACES)
-                ],
+                ),
                 abstract=entry.findtext("atom:summary", namespaces=NAMESPACES),
-                contributors=[
+                contributors=values(
                     contributor.text
                     for contributor in entry.findall("atom:contributor", NAMESPACES)
-                ],
+                ),
                 modified=unwrap(
                     entry.findtext("atom:updated", namespaces=NAMESPACES),
                     parse_temporal,
@@ -62,10 +88,10 @@ def parse_atom_feed(source: Union[BinaryIO, bytes]) -> SearchResultPage:
                     source.text
                     for source in entry.findall("atom:link[@rel='via']", NAMESPACES)
                 ],
-                language=entry.findtext("atom:language", namespaces=NAMESPACES),
-                rights=entry.findtext("atom:rights", namespaces=NAMESPACES),
-                envelope=unwrap(
-                    entry.find("georss:*", NAMESPACES), parse_georss
+                language=value(entry.findtext("atom:language", namespaces=NAMESPACES)),
+                rights=value(entry.findtext("atom:rights", namespaces=NAMESPACES)),
+                envelope=unwrap_element(
+                    entry.find("georss:*", NAMESPACES), parse_envelope
                 ),
             )
             for entry in root.findall("atom:entry", NAMESPACES)
@@ -107,3 +133,20 @@ def parse_atom_feed(source: Union[BinaryIO, bytes]) -> SearchResultPage:
             lambda l: l.attrib["href"],
         ),
     )
+
+
+def parse_atom_feeds(sources: Iterable[XmlSource], max_workers: Optional[int] = None,
+                     intern: Optional[InternTable] = None,
+                     huge_tree: bool = False) -> List[SearchResultPage]:
+    """
+    Parses many Atom feeds, e.g. downloaded result pages, in a thread pool.
+    lxml releases the GIL while libxml2 parses the documents, so only that
+    step runs in parallel; extracting the result items holds the GIL. The
+    ``intern`` table is shared by all workers. The pages are returned in the
+    order of ``sources``.
+    """
+    with ThreadPoolExecutor(max_workers) as executor:
+        return list(executor.map(
+            lambda source: parse_atom_feed(source, intern=intern, huge_tree=huge_tree),
+            sources,
+        ))
@@ -0,0 +1,185 @@
+"""
+Incremental (delta) harvesting.
+
+A :class:`HarvestState` remembers the high-water mark of the modification
+times of all harvested items and a compact set of digests of the
+``(id, modified)`` pairs already emitted. :func:`harvest_delta` uses it to
+emit only new or changed items: when the endpoint supports the OpenSearch
+time extension, the search is restricted to items modified since the
+watermark, otherwise paging stops once the (newest first) entries fall below
+the watermark.
+"""
+import base64
+import hashlib
+import heapq
+from array import array
+from bisect import bisect_left
+import json
+import os
+import re
+import sys
+from datetime import datetime
+from typing import AsyncIterator, Awaitable, Callable, Iterable, Optional, Set
+
+from .description import Url
+from .paging import PageSizeTuner, paginate
+from .result import SearchResultItem, SearchResultPage
+from .utils import parse_datetime, unwrap
+
+
+__all__ = ["HarvestState", "time_restriction", "harvest_delta"]
+
+
+DIGEST_SIZE = 8
+# the namespace prefixes of the template parameters are not kept by the
+# description parser, so any "{<prefix>:start}" is taken as the time extension
+TIME_START_PATTERN = re.compile(r"\{[^:{}]+:start\??\}")
+
+
+def time_restriction(url: Url) -> bool:
+    """
+    Whether ``url`` accepts the ``{time:start}`` parameter of the OpenSearch
+    time extension. As the namespace prefixes are not resolved, this matches
+    a ``start`` parameter of any prefix.
+    """
+    return bool(TIME_START_PATTERN.search(url.template)) or any(
+        parameter.value is not None and TIME_START_PATTERN.fullmatch(parameter.value)
+        for parameter in url.parameters
+    )
+
+
+def modification_time(item: SearchResultItem) -> Optional[datetime]:
+    if isinstance(item.modified, tuple):
+        return item.modified[1]
+    return item.modified
+
+
+class HarvestState:
+    """
+    The watermark and seen items of previous harvests. Seen items are kept as
+    8 byte digests: in memory in a sorted array (about 8 bytes per item) plus
+    a set of recent additions, merged into the array once it grows, and on
+    disk base64 encoded, i.e. about 11 bytes per item.
+    """
+    def __init__(self, watermark: Optional[datetime] = None,
+                 seen: Optional[Iterable[int]] = None):
+        self.watermark = watermark
+        self.digests = array("Q", sorted(set(seen or ())))
+        self.recent: Set[int] = set()
+
+    def __len__(self) -> int:
+        return len(self.digests) + len(self.recent)
+
+    def __contains__(self, digest: int) -> bool:
+        if digest in self.recent:
+            return True
+        index = bisect_left(self.digests, digest)
+        return index < len(self.digests) and self.digests[index] == digest
+
+    def _merge(self) -> None:
+        if self.recent:
+            # merged straight into a new array, without a list of all digests
+            self.digests = array("Q", heapq.merge(self.digests, sorted(self.recent)))
+            self.recent = set()
+
+    @staticmethod
+    def digest(item: SearchResultItem) -> int:
+        modified = modification_time(item)
+        key = f"{item.id}\0{modified.isoformat() if modified else ''}"
+        return int.from_bytes(
+            hashlib.blake2b(key.encode(), digest_size=DIGEST_SIZE).digest(), "big"
+        )
+
+    def is_new(self, item: SearchResultItem) -> bool:
+        return self.digest(item) not in self
+
+    def add(self, item: SearchResultItem) -> bool:
+        """
+        Records ``item`` as seen, returning whether it was new.
+        """
+        digest = self.digest(item)
+        if digest in self:
+            return False
+        self.recent.add(digest)
+        if len(self.recent) > max(65536, len(self.digests) // 8):
+            self._merge()
+        return True
+
+    @classmethod
+    def load(cls, path: str) -> "HarvestState":
+        """
+        Loads the state stored at ``path``, or an empty one if there is none.
+        """
+        if not os.path.exists(path):
+            return cls()
+        with open(path) as f:
+            data = json.load(f)
+        digests = array("Q", base64.b64decode(data["seen"]))
+        if sys.byteorder != "big":
+            digests.byteswap()
+        state = cls(watermark=unwrap(data.get("watermark"), parse_datetime))
+        state.digests = digests
+        return state
+
+    def save(self, path: str) -> None:
+        self._merge()
+        digests = array("Q", self.digests)
+        if sys.byteorder != "big":
+            digests.byteswap()
+        raw = digests.tobytes()
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w") as f:
+            json.dump({
+                "watermark": self.watermark.isoformat() if self.watermark else None,
+                "seen": base64.b64encode(raw).decode("ascii"),
+            }, f)
+        os.replace(tmp_path, path)
+
+
+FetchSince = Callable[[int, int, Optional[datetime]], Awaitable[bytes]]
+
+
+async def harvest_delta(fetch: FetchSince, state: HarvestState,
+                        time_restricted: bool = False, newest_first: bool = True,
+                        tuner: Optional[PageSizeTuner] = None, count: int = 10,
+                        start_index: int = 1, index_offset: int = 1,
+                        parse: Optional[Callable[[bytes], SearchResultPage]] = None,
+                        ) -> AsyncIterator[SearchResultItem]:
+    """
+    Yields the items which are new or changed since the harvests recorded in
+    ``state``. Pages are requested by ``fetch(start_index, count, since)``,
+    where ``since`` is the watermark to pass as ``{time:start}`` when
+    ``time_restricted`` (see :func:`time_restriction`) and ``None`` otherwise.
+
+    Without time restriction, the results are expected to be sorted by
+    modification time, ``newest_first``, to stop paging at the watermark.
+    Otherwise all pages are requested, but still only the delta emitted.
+
+    The watermark is advanced once the harvest completes.
+    """
+    watermark = state.watermark
+    since = watermark if time_restricted else None
+    newest = watermark
+
+    async def fetch_page(index: int, count: int) -> bytes:
+        return await fetch(index, count, since)
+
+    pages = paginate(fetch_page, tuner, count, start_index, index_offset, parse)
+    async for page in pages:
+        reached_watermark = False
+        for item in page.items:
+            modified = modification_time(item)
+            if modified is not None:
+                if watermark is not None and modified < watermark:
+                    reached_watermark = True
+                if newest is None or modified > newest:
+                    newest = modified
+            if state.add(item):
+                yield item
+
+        if reached_watermark and newest_first and not time_restricted:
+            # everything further down is older than what was already harvested
+            await pages.aclose()
+            break
+
+    state.watermark = newest
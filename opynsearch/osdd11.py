@@ -1,6 +1,6 @@
 from datetime import datetime, timedelta
 from io import BytesIO
-from typing import Any, cast, Callable, List, Optional, TypeVar, Union, BinaryIO
+from typing import Any, cast, Callable, List, Optional, TypeVar
 
 from lxml.etree import QName
 
@@ -9,7 +9,7 @@ from .description import (
     HttpMethod
 )
 from .utils import unwrap, unwrap_default
-from .xml import ElementMaker, Element, parse_xml
+from .xml import ElementMaker, Element, XmlSource, parse_xml
 
 
 NS_OSDD = "http://a9.com/-/spec/opensearch/1.1/"
@@ -61,8 +61,8 @@ def parse_step(value: str) -> StepType:
     return value
 
 
-def parse_osdd11(source: Union[BinaryIO, bytes]) -> Description:
-    root = parse_xml(source, (NS_OSDD, "OpenSearchDescription"))
+def parse_osdd11(source: XmlSource, huge_tree: bool = False) -> Description:
+    root = parse_xml(source, (NS_OSDD, "OpenSearchDescription"), huge_tree=huge_tree)
     return Description(
         short_name=root.findtext("os:ShortName", namespaces=NAMESPACES),
         description=root.findtext("os:Description", namespaces=NAMESPACES),
@@ -0,0 +1,213 @@
+"""
+Paginated searches with adaptive page sizes.
+
+The :class:`PageSizeTuner` chooses the ``{count}`` of each request: it
+measures the items per second every page size achieves and grows the page
+size geometrically while the throughput improves, then bisects towards the
+best size. It respects the ``count`` limits of the description's URL
+parameters, the ``os:itemsPerPage`` the server actually returns and optional
+latency and response size budgets. Converged sizes are recorded per endpoint
+in a :class:`PageSizeStore` for reuse.
+"""
+import json
+import math
+import os
+import re
+import time
+from typing import AsyncGenerator, Awaitable, Callable, Dict, Optional, Set, Tuple
+
+from .description import Url
+from .result import SearchResultPage
+
+
+__all__ = ["count_bounds", "PageSizeStore", "PageSizeTuner", "paginate"]
+
+
+COUNT_PATTERN = re.compile(r"^\{(?:[^:{}]+:)?count\??\}$")
+
+
+def count_bounds(url: Url, default_maximum: int = 1000) -> Tuple[int, int]:
+    """
+    The minimum and maximum ``count`` allowed by the parameters of ``url``.
+    """
+    minimum, maximum = 1, default_maximum
+    for parameter in url.parameters:
+        if parameter.value is None or not COUNT_PATTERN.match(parameter.value):
+            continue
+        if isinstance(parameter.min_inclusive, (int, float)):
+            minimum = max(minimum, math.ceil(parameter.min_inclusive))
+        if isinstance(parameter.min_exclusive, (int, float)):
+            minimum = max(minimum, math.floor(parameter.min_exclusive) + 1)
+        if isinstance(parameter.max_inclusive, (int, float)):
+            maximum = math.floor(parameter.max_inclusive)
+        if isinstance(parameter.max_exclusive, (int, float)):
+            maximum = min(maximum, math.ceil(parameter.max_exclusive) - 1)
+    return minimum, max(minimum, maximum)
+
+
+class PageSizeStore:
+    """
+    Page sizes chosen per endpoint, optionally persisted as JSON at ``path``.
+    """
+    def __init__(self, path: Optional[str] = None):
+        self.path = path
+        self.sizes: Dict[str, int] = {}
+        if path is not None and os.path.exists(path):
+            with open(path) as f:
+                self.sizes = {key: int(value) for key, value in json.load(f).items()}
+
+    def get(self, endpoint: str) -> Optional[int]:
+        return self.sizes.get(endpoint)
+
+    def record(self, endpoint: str, size: int) -> None:
+        self.sizes[endpoint] = size
+        if self.path is not None:
+            with open(self.path, "w") as f:
+                json.dump(self.sizes, f, indent=2, sort_keys=True)
+
+
+class PageSizeTuner:
+    def __init__(self, minimum: int = 1, maximum: int = 1000, initial: Optional[int] = None,
+                 growth: float = 2.0, tolerance: float = 0.05,
+                 max_latency: Optional[float] = None, max_bytes: Optional[int] = None,
+                 store: Optional[PageSizeStore] = None, endpoint: Optional[str] = None):
+        if minimum > maximum:
+            raise ValueError(f"Invalid page size range {minimum}-{maximum}")
+        self.minimum = minimum
+        self.maximum = maximum
+        self.growth = growth
+        self.tolerance = tolerance
+        self.max_latency = max_latency
+        self.max_bytes = max_bytes
+        self.store = store
+        self.endpoint = endpoint
+
+        # smoothed items per second per page size
+        self.throughput: Dict[int, float] = {}
+        self.best: Optional[int] = None
+        # smallest page size known to be slower than the best one
+        self.ceiling: Optional[int] = None
+        self.converged = False
+
+        stored = store.get(endpoint) if store is not None and endpoint is not None else None
+        if stored is not None:
+            self.size = self._clamp(stored)
+            self.best = self.size
+            self.converged = True
+        else:
+            self.size = self._clamp(initial if initial is not None else 10)
+
+    @classmethod
+    def from_url(cls, url: Url, store: Optional[PageSizeStore] = None,
+                 **kwargs) -> "PageSizeTuner":
+        """
+        Creates a tuner bounded by the ``count`` parameter limits of ``url``
+        (narrowed further by ``minimum`` and ``maximum``), recording the
+        chosen size for its template in ``store``.
+        """
+        maximum = kwargs.pop("maximum", 1000)
+        minimum, url_maximum = count_bounds(url, maximum)
+        minimum = max(minimum, kwargs.pop("minimum", 1))
+        maximum = min(maximum, url_maximum)
+        return cls(minimum, maximum, store=store, endpoint=url.template, **kwargs)
+
+    def _clamp(self, size: int) -> int:
+        return max(self.minimum, min(self.maximum, size))
+
+    def next_count(self) -> int:
+        return self.size
+
+    def observe(self, count: int, items: int, latency: float, nbytes: int,
+                items_per_page: Optional[int] = None, last: bool = False) -> None:
+        """
+        Records a page of ``items`` requested with ``count`` which took
+        ``latency`` seconds for ``nbytes`` bytes, and picks the next size.
+        ``last`` marks the last page of the results, whose ``items_per_page``
+        may just be the number of remaining items.
+        """
+        requested = count
+        if not last and items_per_page is not None and 0 < items_per_page < count:
+            # the server caps the page size on its own
+            self.maximum = max(self.minimum, items_per_page)
+            count = items_per_page
+        budget = 1.0
+        if self.max_latency is not None and latency > self.max_latency:
+            budget = min(budget, self.max_latency / latency)
+        if self.max_bytes is not None and nbytes > self.max_bytes:
+            budget = min(budget, self.max_bytes / nbytes)
+        if budget < 1.0:
+            self.maximum = max(self.minimum, int(count * budget))
+
+        if items >= requested and latency > 0:
+            # partial (e.g. last or capped) pages say nothing about the throughput
+            rate = items / latency
+            previous = self.throughput.get(count)
+            self.throughput[count] = rate if previous is None else (previous + rate) / 2
+            self._step(count)
+
+        self.size = self._clamp(self.size)
+        if self.best is not None and self.best > self.maximum:
+            self.best = self.maximum
+        if self.converged and self.best is not None:
+            self.size = self._clamp(self.best)
+
+    def _step(self, count: int) -> None:
+        if self.converged:
+            return
+        best = self.best
+        if best is None or self.throughput[count] > self.throughput[best] * (1 + self.tolerance):
+            self.best = best = count
+        elif count > best:
+            self.ceiling = count if self.ceiling is None else min(self.ceiling, count)
+
+        if self.ceiling is None:
+            candidate = self._clamp(math.ceil(best * self.growth))
+        else:
+            candidate = (best + self.ceiling) // 2
+        tried: Set[int] = set(self.throughput)
+        if candidate == best or candidate in tried:
+            self._converge(best)
+        else:
+            self.size = candidate
+
+    def _converge(self, size: int) -> None:
+        self.converged = True
+        self.size = size
+        if self.store is not None and self.endpoint is not None:
+            self.store.record(self.endpoint, size)
+
+
+FetchPage = Callable[[int, int], Awaitable[bytes]]
+
+
+async def paginate(fetch: FetchPage, tuner: Optional[PageSizeTuner] = None,
+                   count: int = 10, start_index: int = 1, index_offset: int = 1,
+                   parse: Optional[Callable[[bytes], SearchResultPage]] = None,
+                   ) -> AsyncGenerator[SearchResultPage, None]:
+    """
+    Iterates over all result pages, requested by ``fetch(start_index, count)``
+    returning the raw response. Without a ``tuner``, the fixed ``count`` is
+    used. ``index_offset`` is the index of the first result, as in
+    :attr:`Url.index_offset`.
+    """
+    if parse is None:
+        from .atom import parse_atom_feed
+        parse = parse_atom_feed
+
+    index = start_index
+    while True:
+        requested = tuner.next_count() if tuner is not None else count
+        start = time.monotonic()
+        data = await fetch(index, requested)
+        latency = time.monotonic() - start
+        page = parse(data)
+        last = not page.items or index - index_offset + len(page.items) >= page.total_results
+        if tuner is not None:
+            tuner.observe(
+                requested, len(page.items), latency, len(data), page.items_per_page, last
+            )
+        yield page
+
+        index += len(page.items)
+        if last:
+            break
@@ -0,0 +1,207 @@
+"""
+Request policies for tail-latency control.
+
+A :class:`RequestPolicy` executes a request, given as a callable returning an
+awaitable response, with retries using jittered exponential backoff, optional
+hedging (issuing a duplicate request once the first one is slower than the
+observed latency quantile) and an overall deadline which cancels all
+outstanding attempts. Retries and hedges are only used for idempotent methods.
+
+Policies compose with the :class:`~opynsearch.scheduler.Scheduler` by letting
+each attempt go through it::
+
+    policy.execute(lambda: scheduler.request(url, lambda: client.get(url)))
+"""
+import asyncio
+import random
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import (
+    Any, Awaitable, Callable, Deque, FrozenSet, List, Optional, Set, Tuple, Type, TypeVar
+)
+
+from .scheduler import parse_retry_after
+
+
+__all__ = ["RetryPolicy", "HedgePolicy", "LatencyTracker", "RequestPolicy"]
+
+
+IDEMPOTENT_METHODS = frozenset(("GET", "HEAD", "OPTIONS", "PUT", "DELETE", "TRACE"))
+
+R = TypeVar("R")
+
+
+def transport_errors() -> Tuple[Type[BaseException], ...]:
+    """
+    The exceptions signalling a failed transport, i.e. worth a retry.
+    """
+    try:
+        from httpx import TransportError
+    except ImportError:  # pragma: no cover
+        return (OSError,)
+    return (OSError, TransportError)
+
+
+@dataclass
+class RetryPolicy:
+    attempts: int = 3
+    backoff: float = 0.1
+    max_backoff: float = 10.0
+    status_codes: FrozenSet[int] = frozenset((429, 500, 502, 503, 504))
+    exceptions: Tuple[Type[BaseException], ...] = field(default_factory=transport_errors)
+    # honor Retry-After headers of retried responses, up to max_backoff
+    respect_retry_after: bool = True
+
+    def __post_init__(self) -> None:
+        if self.attempts < 1:
+            raise ValueError(f"Invalid number of attempts {self.attempts}")
+
+    def delay(self, attempt: int) -> float:
+        """
+        The "full jitter" backoff before retry number ``attempt`` (counting
+        from 0): uniformly chosen between zero and the exponential backoff.
+        """
+        return random.uniform(0, min(self.max_backoff, self.backoff * 2 ** attempt))
+
+
+@dataclass
+class HedgePolicy:
+    quantile: float = 0.95
+    # delay used until enough latencies were observed
+    initial_delay: float = 1.0
+    min_delay: float = 0.01
+    max_hedges: int = 1
+    min_samples: int = 20
+    window: int = 200
+
+    def delay(self, latencies: "LatencyTracker") -> float:
+        if len(latencies) < self.min_samples:
+            return self.initial_delay
+        return max(self.min_delay, latencies.quantile(self.quantile))
+
+
+class LatencyTracker:
+    """
+    Keeps the latencies of the last ``window`` attempts which succeeded or
+    were cancelled (e.g. hedged away) while still outstanding.
+    """
+    def __init__(self, window: int = 200):
+        self.samples: Deque[float] = deque(maxlen=window)
+
+    def __len__(self) -> int:
+        return len(self.samples)
+
+    def add(self, latency: float) -> None:
+        self.samples.append(latency)
+
+    def quantile(self, q: float) -> float:
+        if not self.samples:
+            raise ValueError("No latencies observed")
+        ordered = sorted(self.samples)
+        return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+@dataclass
+class RequestPolicy:
+    retry: Optional[RetryPolicy] = field(default_factory=RetryPolicy)
+    hedge: Optional[HedgePolicy] = None
+    # overall time budget per request in seconds, including retries
+    deadline: Optional[float] = None
+
+    def __post_init__(self) -> None:
+        self.latencies = LatencyTracker(self.hedge.window if self.hedge else 200)
+        self.retries = 0
+        self.hedges = 0
+
+    async def execute(self, send: Callable[[], Awaitable[R]], method: str = "GET",
+                      deadline: Optional[float] = None) -> R:
+        """
+        Executes the request sent by ``send``. Raises
+        :class:`asyncio.TimeoutError` when the deadline (``deadline`` or the
+        policy's default) passes, after cancelling all outstanding attempts.
+        """
+        if method.upper() in IDEMPOTENT_METHODS:
+            request = self._retrying(send)
+        else:
+            request = self._timed(send)
+
+        timeout = deadline if deadline is not None else self.deadline
+        if timeout is None:
+            return await request
+        return await asyncio.wait_for(request, timeout)
+
+    async def _retrying(self, send: Callable[[], Awaitable[R]]) -> R:
+        retry = self.retry
+        attempts = retry.attempts if retry else 1
+        for attempt in range(attempts):
+            last = attempt == attempts - 1
+            try:
+                response = await self._hedged(send)
+            except asyncio.CancelledError:
+                # an Exception up to Python 3.7: never retry a cancellation
+                raise
+            except Exception as e:
+                if last or retry is None or not isinstance(e, retry.exceptions):
+                    raise
+                delay = retry.delay(attempt)
+            else:
+                status_code = getattr(response, "status_code", None)
+                if last or retry is None or status_code not in retry.status_codes:
+                    return response
+                delay = retry.delay(attempt)
+                headers: Any = getattr(response, "headers", None) or {}
+                retry_after = parse_retry_after(headers.get("Retry-After"))
+                if retry.respect_retry_after and retry_after is not None:
+                    delay = max(delay, min(retry_after, retry.max_backoff))
+
+            self.retries += 1
+            await asyncio.sleep(delay)
+        raise AssertionError("unreachable")
+
+    async def _hedged(self, send: Callable[[], Awaitable[R]]) -> R:
+        if self.hedge is None:
+            return await self._timed(send)
+
+        delay = self.hedge.delay(self.latencies)
+        pending: Set["asyncio.Future[R]"] = {asyncio.ensure_future(self._timed(send))}
+        launched = 1
+        errors: List[BaseException] = []
+        try:
+            while pending:
+                can_hedge = launched <= self.hedge.max_hedges
+                done, pending = await asyncio.wait(
+                    pending,
+                    timeout=delay if can_hedge else None,
+                    return_when=asyncio.FIRST_COMPLETED,
+                )
+                for task in done:
+                    error = task.exception()
+                    if error is None:
+                        return task.result()
+                    errors.append(error)
+
+                if not done:
+                    # the outstanding attempts are slower than expected: race
+                    # another one against them
+                    pending.add(asyncio.ensure_future(self._timed(send)))
+                    launched += 1
+                    self.hedges += 1
+            raise errors[-1]
+        finally:
+            for task in pending:
+                task.cancel()
+            # wait for the cancelled attempts to release their connections
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    async def _timed(self, send: Callable[[], Awaitable[R]]) -> R:
+        start = time.monotonic()
+        try:
+            response = await send()
+        except asyncio.CancelledError:
+            # hedged away or past the deadline: the elapsed time is only a
+            # lower bound, but leaving it out would hide the slow tail
+            self.latencies.add(time.monotonic() - start)
+            raise
+        self.latencies.add(time.monotonic() - start)
+        return response
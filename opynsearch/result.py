@@ -1,6 +1,6 @@
 from dataclasses import dataclass, field
 from datetime import datetime
-from typing import Iterator, List, Optional, Tuple, Union
+from typing import Iterator, List, Optional, Sequence, Tuple, Union
 
 
 @dataclass
@@ -50,9 +50,9 @@ class SearchResultItem:
     id: str
     identifier: str
     creator: Optional[str] = None
-    subjects: List[str] = field(default_factory=list)
+    subjects: Sequence[str] = field(default_factory=list)
     abstract: Optional[str] = None
-    contributors: List[str] = field(default_factory=list)
+    contributors: Sequence[str] = field(default_factory=list)
     modified: Optional[Union[datetime, Tuple[datetime, datetime]]] = None
     date: Optional[Union[datetime, Tuple[datetime, datetime]]] = None
     sources: List[str] = field(default_factory=list)
@@ -0,0 +1,307 @@
+"""
+Per-host request scheduling.
+
+The :class:`Scheduler` wraps the individual requests a search client sends and
+limits them per host: concurrency is adapted with AIMD (additive increase on
+healthy responses, multiplicative decrease on throttling, errors or rising
+latency), ``Retry-After`` headers pause the host, and an optional token bucket
+enforces a configured request rate.
+
+The scheduler is transport agnostic: requests are passed in as callables
+returning an awaitable response object with ``status_code`` and ``headers``
+attributes, as e.g. ``httpx.Response``.
+"""
+import asyncio
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any, Awaitable, Callable, Deque, Dict, Iterable, Optional, TypeVar
+)
+from urllib.parse import urlsplit
+
+
+__all__ = ["RateLimit", "HostLimits", "HostMetrics", "TokenBucket", "Scheduler"]
+
+
+THROTTLE_STATUS_CODES = frozenset((429, 503))
+
+R = TypeVar("R")
+
+
+@dataclass
+class RateLimit:
+    rate: float
+    burst: int = 1
+
+
+@dataclass
+class HostLimits:
+    initial_concurrency: int = 4
+    min_concurrency: int = 1
+    max_concurrency: int = 64
+    rate_limit: Optional[RateLimit] = None
+    # additive increase per limit's worth of healthy responses
+    increase: float = 1.0
+    # multiplicative decrease on congestion
+    decrease: float = 0.5
+    # latency above this multiple of the baseline latency counts as congestion
+    latency_tolerance: float = 3.0
+    # status codes counted as errors; throttling codes are always included
+    error_status_codes: Iterable[int] = field(
+        default_factory=lambda: range(500, 600)
+    )
+
+
+@dataclass
+class HostMetrics:
+    host: str
+    concurrency_limit: int
+    in_flight: int
+    queued: int
+    rate: Optional[float]
+    requests: int
+    throttled: int
+    errors: int
+    latency: Optional[float]
+    baseline_latency: Optional[float]
+    retry_after: float
+
+
+class TokenBucket:
+    """
+    Token bucket allowing ``rate`` requests per second with bursts up to
+    ``burst``. :meth:`reserve` hands out tokens in advance, returning how
+    long the caller has to wait until its token is actually available.
+    """
+    def __init__(self, rate: float, burst: int = 1,
+                 clock: Callable[[], float] = time.monotonic):
+        if rate <= 0:
+            raise ValueError(f"Rate must be positive, got {rate}")
+        self.rate = rate
+        self.burst = max(1, burst)
+        self.clock = clock
+        self.tokens = float(self.burst)
+        self.updated = clock()
+
+    def reserve(self) -> float:
+        now = self.clock()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        self.tokens -= 1
+        if self.tokens >= 0:
+            return 0.0
+        return -self.tokens / self.rate
+
+
+def parse_retry_after(value: Optional[str], now: Optional[datetime] = None) -> Optional[float]:
+    """
+    Parses a ``Retry-After`` header, either in delta-seconds or as an HTTP
+    date, into a number of seconds.
+    """
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        date = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError):
+        return None
+    if date.tzinfo is None:
+        date = date.replace(tzinfo=timezone.utc)
+    return max(0.0, (date - (now or datetime.now(timezone.utc))).total_seconds())
+
+
+class _HostState:
+    def __init__(self, host: str, limits: HostLimits):
+        self.host = host
+        self.limits = limits
+        self.error_status_codes = frozenset(limits.error_status_codes) | THROTTLE_STATUS_CODES
+        self.limit = float(min(
+            max(limits.initial_concurrency, limits.min_concurrency),
+            limits.max_concurrency,
+        ))
+        self.in_flight = 0
+        self.waiters: Deque["asyncio.Future[None]"] = deque()
+        self.bucket = (
+            TokenBucket(limits.rate_limit.rate, limits.rate_limit.burst)
+            if limits.rate_limit else None
+        )
+        self.blocked_until = 0.0
+        self.last_decrease = float("-inf")
+        self.latency: Optional[float] = None
+        self.baseline_latency: Optional[float] = None
+        self.requests = 0
+        self.throttled = 0
+        self.errors = 0
+
+    @property
+    def slots(self) -> int:
+        return max(1, int(self.limit))
+
+    async def acquire(self) -> None:
+        while self.in_flight >= self.slots:
+            waiter = asyncio.get_event_loop().create_future()
+            self.waiters.append(waiter)
+            try:
+                await waiter
+            except asyncio.CancelledError:
+                if waiter in self.waiters:
+                    self.waiters.remove(waiter)
+                elif not waiter.cancelled():
+                    # woken up, but cancelled before running: pass the slot on
+                    self._wake()
+                raise
+        self.in_flight += 1
+
+        try:
+            while True:
+                delay = self.blocked_until - time.monotonic()
+                if delay <= 0:
+                    break
+                await asyncio.sleep(delay)
+            if self.bucket is not None:
+                delay = self.bucket.reserve()
+                if delay > 0:
+                    await asyncio.sleep(delay)
+        except BaseException:
+            self.in_flight -= 1
+            self._wake()
+            raise
+
+    def release(self, latency: Optional[float], status_code: Optional[int],
+                retry_after: Optional[float] = None, failed: bool = False) -> None:
+        self.in_flight -= 1
+        self.requests += 1
+        now = time.monotonic()
+
+        if retry_after:
+            self.blocked_until = max(self.blocked_until, now + retry_after)
+
+        if status_code in THROTTLE_STATUS_CODES:
+            self.throttled += 1
+            self._decrease(now)
+        elif failed or status_code in self.error_status_codes:
+            self.errors += 1
+            self._decrease(now)
+        elif latency is not None:
+            self._observe_latency(latency)
+            assert self.latency is not None and self.baseline_latency is not None
+            if self.latency > self.baseline_latency * self.limits.latency_tolerance:
+                self._decrease(now)
+            else:
+                self.limit = min(
+                    float(self.limits.max_concurrency),
+                    self.limit + self.limits.increase / self.slots,
+                )
+        self._wake()
+
+    def _observe_latency(self, latency: float) -> None:
+        if self.latency is None:
+            self.latency = latency
+        else:
+            self.latency += (latency - self.latency) * 0.2
+        if self.baseline_latency is None or latency < self.baseline_latency:
+            self.baseline_latency = latency
+        else:
+            # let the baseline drift upwards slowly, in case the server got
+            # permanently slower
+            self.baseline_latency += (latency - self.baseline_latency) * 0.01
+
+    def _decrease(self, now: float) -> None:
+        # requests in flight during a congestion event usually fail together:
+        # only back off once per round trip
+        if now - self.last_decrease < (self.latency or 0.0):
+            return
+        self.last_decrease = now
+        self.limit = max(
+            float(self.limits.min_concurrency),
+            self.limit * self.limits.decrease,
+        )
+
+    def _wake(self) -> None:
+        free = self.slots - self.in_flight
+        while free > 0 and self.waiters:
+            waiter = self.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(None)
+                free -= 1
+
+    def metrics(self) -> HostMetrics:
+        rate_limit = self.limits.rate_limit
+        return HostMetrics(
+            host=self.host,
+            concurrency_limit=self.slots,
+            in_flight=self.in_flight,
+            queued=len(self.waiters),
+            rate=rate_limit.rate if rate_limit else None,
+            requests=self.requests,
+            throttled=self.throttled,
+            errors=self.errors,
+            latency=self.latency,
+            baseline_latency=self.baseline_latency,
+            retry_after=max(0.0, self.blocked_until - time.monotonic()),
+        )
+
+
+class Scheduler:
+    """
+    Schedules requests per host. ``hosts`` maps host names (the ``netloc``
+    of the URL, e.g. ``"example.com:8080"``) to their limits, all other hosts
+    use ``default``.
+    """
+    def __init__(self, default: Optional[HostLimits] = None,
+                 hosts: Optional[Dict[str, HostLimits]] = None):
+        self.default = default or HostLimits()
+        self.hosts = dict(hosts or {})
+        self._states: Dict[str, _HostState] = {}
+
+    def _state(self, url: str) -> _HostState:
+        host = urlsplit(url).netloc
+        try:
+            return self._states[host]
+        except KeyError:
+            state = self._states[host] = _HostState(
+                host, self.hosts.get(host, self.default)
+            )
+            return state
+
+    async def request(self, url: str, send: Callable[[], Awaitable[R]]) -> R:
+        """
+        Waits for a free slot on the host of ``url`` and sends the request by
+        calling ``send``. The response status code, ``Retry-After`` header
+        and latency are fed back to adapt the limits of the host.
+        """
+        state = self._state(url)
+        await state.acquire()
+        start = time.monotonic()
+        try:
+            response = await send()
+        except asyncio.CancelledError:
+            # not a signal about the server: do not adapt the limits
+            state.in_flight -= 1
+            state._wake()
+            raise
+        except Exception:
+            state.release(None, None, failed=True)
+            raise
+
+        status_code: Optional[int] = getattr(response, "status_code", None)
+        headers: Any = getattr(response, "headers", None) or {}
+        state.release(
+            time.monotonic() - start,
+            status_code,
+            parse_retry_after(headers.get("Retry-After")),
+        )
+        return response
+
+    def metrics(self) -> Dict[str, HostMetrics]:
+        """
+        The current limits and counters of all hosts requested so far.
+        """
+        return {host: state.metrics() for host, state in self._states.items()}
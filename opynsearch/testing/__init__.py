@@ -0,0 +1,8 @@
+"""
+Tools for testing and benchmarking OpenSearch clients offline.
+"""
+from .load import LoadReport, run_load
+from .server import MockServer, constant, lognormal, uniform
+
+
+__all__ = ["LoadReport", "MockServer", "constant", "lognormal", "run_load", "uniform"]
@@ -0,0 +1,79 @@
+"""
+Runs the mock server, or a load test against it::
+
+    python -m opynsearch.testing serve --port 8080 --latency 0.05
+    python -m opynsearch.testing load --requests 2000 --concurrency 50
+    python -m opynsearch.testing memory --total-results 20000 --count 100
+"""
+import argparse
+import asyncio
+from typing import List, Optional
+
+from ..utils import InternTable
+from .load import run_load
+from .memory import retained_memory
+from .server import MockServer, lognormal
+
+
+def main(args: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(prog="python -m opynsearch.testing")
+    parser.add_argument("command", choices=["serve", "load", "memory"])
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=0)
+    parser.add_argument("--total-results", type=int, default=1000)
+    parser.add_argument("--latency", type=float, default=None,
+                        help="median latency in seconds (log-normally distributed)")
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--summary-size", type=int, default=200)
+    parser.add_argument("--requests", type=int, default=1000)
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--count", type=int, default=10)
+    parsed = parser.parse_args(args)
+
+    server = MockServer(
+        total_results=parsed.total_results,
+        latency=lognormal(parsed.latency, 0.5) if parsed.latency else None,
+        error_rate=parsed.error_rate,
+        summary_size=parsed.summary_size,
+        host=parsed.host,
+        port=parsed.port,
+    )
+
+    async def serve() -> None:
+        async with server:
+            print(f"Serving {server.url}/description.xml")
+            await asyncio.Event().wait()
+
+    async def load() -> None:
+        async with server:
+            report = await run_load(
+                server.url,
+                requests=parsed.requests,
+                concurrency=parsed.concurrency,
+                count=parsed.count,
+                total_results=parsed.total_results,
+            )
+            print(report)
+
+    if parsed.command == "memory":
+        feeds = [
+            server.feed(None, start_index, parsed.count)
+            for start_index in range(1, parsed.total_results + 1, parsed.count)
+        ]
+        for name, intern in [
+            ("plain", None),
+            ("interned", lambda: InternTable()),
+            ("interned tuples", lambda: InternTable(tuples=True)),
+        ]:
+            retained = retained_memory(feeds, intern)
+            print(f"{name}: {retained / 1024 / 1024:.1f} MiB for {parsed.total_results} items")
+        return
+
+    try:
+        asyncio.run(serve() if parsed.command == "serve" else load())
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+"""
+Load generation against an OpenSearch endpoint, e.g. a :class:`MockServer`.
+"""
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import urlencode
+
+from ..policy import RequestPolicy
+from ..scheduler import Scheduler
+
+
+__all__ = ["LoadReport", "run_load"]
+
+
+@dataclass
+class LoadReport:
+    requests: int = 0
+    errors: int = 0
+    bytes: int = 0
+    duration: float = 0.0
+    latencies: List[float] = field(default_factory=list)
+
+    @property
+    def requests_per_second(self) -> float:
+        return self.requests / self.duration if self.duration else 0.0
+
+    def percentile(self, q: float) -> float:
+        if not self.latencies:
+            return 0.0
+        ordered = sorted(self.latencies)
+        return ordered[min(len(ordered) - 1, int(q / 100 * len(ordered)))]
+
+    def __str__(self) -> str:
+        return (
+            f"{self.requests} requests ({self.errors} errors, {self.bytes} bytes) "
+            f"in {self.duration:.2f}s: {self.requests_per_second:.1f} req/s, "
+            f"latency p50 {self.percentile(50) * 1000:.1f} ms, "
+            f"p90 {self.percentile(90) * 1000:.1f} ms, "
+            f"p99 {self.percentile(99) * 1000:.1f} ms"
+        )
+
+
+def search_url(base_url: str, start_index: int, count: int,
+               search_terms: Optional[str] = None) -> str:
+    query: Dict[str, Any] = {"startIndex": start_index, "count": count}
+    if search_terms:
+        query["q"] = search_terms
+    return f"{base_url}/search?{urlencode(query)}"
+
+
+async def run_load(base_url: str, requests: int = 1000, concurrency: int = 10,
+                   count: int = 10, total_results: int = 1000,
+                   search_terms: Optional[str] = None,
+                   scheduler: Optional[Scheduler] = None,
+                   policy: Optional[RequestPolicy] = None,
+                   url_for: Optional[Callable[[int, int], str]] = None,
+                   client: Any = None) -> LoadReport:
+    """
+    Sends ``requests`` page requests with up to ``concurrency`` of them in
+    flight, cycling through the pages of a collection of ``total_results``.
+    Requests are optionally passed through a ``scheduler`` and ``policy`` to
+    measure their effect.
+    """
+    import httpx
+
+    if url_for is None:
+        def url_for(start_index: int, count: int) -> str:
+            return search_url(base_url, start_index, count, search_terms)
+
+    report = LoadReport()
+    pages = max(1, total_results // count)
+    queue: "asyncio.Queue[str]" = asyncio.Queue()
+    for i in range(requests):
+        queue.put_nowait(url_for((i % pages) * count + 1, count))
+
+    async def worker(client: Any) -> None:
+        while not queue.empty():
+            url = queue.get_nowait()
+
+            def send() -> Any:
+                if scheduler is not None:
+                    return scheduler.request(url, lambda: client.get(url))
+                return client.get(url)
+
+            start = time.monotonic()
+            try:
+                response = await (policy.execute(send) if policy is not None else send())
+            except Exception:
+                report.errors += 1
+            else:
+                if response.status_code >= 400:
+                    report.errors += 1
+                report.bytes += len(response.content)
+            report.latencies.append(time.monotonic() - start)
+            report.requests += 1
+
+    async def run(client: Any) -> None:
+        start = time.monotonic()
+        await asyncio.gather(*[worker(client) for _ in range(concurrency)])
+        report.duration = time.monotonic() - start
+
+    if client is not None:
+        await run(client)
+    else:
+        limits = httpx.Limits(max_connections=concurrency)
+        async with httpx.AsyncClient(limits=limits, timeout=None) as client:
+            await run(client)
+    return report
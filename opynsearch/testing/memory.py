@@ -0,0 +1,35 @@
+"""
+Memory benchmark for holding parsed search results.
+"""
+import gc
+import tracemalloc
+from typing import Callable, List, Optional
+
+from ..atom import parse_atom_feed
+from ..result import SearchResultPage
+from ..utils import InternTable
+
+
+__all__ = ["retained_memory"]
+
+
+def retained_memory(feeds: List[bytes],
+                    intern: Optional[Callable[[], InternTable]] = None) -> int:
+    """
+    The number of bytes retained by the pages parsed from ``feeds``, all
+    parsed with a single intern table created by ``intern`` (if given).
+    """
+    gc.collect()
+    tracemalloc.start()
+    try:
+        table = intern() if intern is not None else None
+        pages: List[SearchResultPage] = [
+            parse_atom_feed(feed, intern=table) for feed in feeds
+        ]
+        del table
+        gc.collect()
+        retained, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    del pages
+    return retained
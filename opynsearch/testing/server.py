@@ -0,0 +1,285 @@
+"""
+A local OpenSearch stand-in server for tests and benchmarks.
+
+:class:`MockServer` serves an OpenSearch description document at
+``/description.xml`` and synthetic Atom result pages at ``/search``, honoring
+the ``q`` (``{searchTerms}``), ``startIndex`` (``{startIndex}``), ``count``
+(``{count}``) and, optionally, ``start`` (``{time:start}``) query parameters.
+Latency, error responses and response sizes can be configured to emulate the
+behavior of real catalogues.
+"""
+import asyncio
+import math
+import random
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Callable, Dict, List, Optional, Tuple
+from urllib.parse import parse_qs, urlencode, urlsplit
+
+from lxml.etree import tostring
+
+from ..atom import NS_ATOM, NS_DC
+from ..description import Description, Parameter, Url
+from ..osdd11 import NS_OSDD, encode_osdd11
+from ..utils import parse_datetime
+from ..xml import ElementMaker
+
+
+__all__ = ["MockServer", "constant", "uniform", "lognormal"]
+
+
+Latency = Callable[[], float]
+
+ATOM = ElementMaker(namespace=NS_ATOM, nsmap={None: NS_ATOM, "os": NS_OSDD, "dc": NS_DC})
+OS = ElementMaker(namespace=NS_OSDD)
+DC = ElementMaker(namespace=NS_DC)
+
+WORDS = [
+    "ocean", "wind", "ice", "land", "cloud", "rain", "snow", "fire",
+    "soil", "forest", "coast", "river", "ozone", "aerosol", "glacier", "crop",
+]
+THEMES = ["climatologyMeteorologyAtmosphere", "oceans", "environment", "imageryBaseMapsEarthCover"]
+PROVIDERS = ["EUMETSAT", "ESA", "NASA"]
+
+REASONS = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests",
+    500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+    504: "Gateway Timeout",
+}
+
+
+def constant(seconds: float) -> Latency:
+    return lambda: seconds
+
+
+def uniform(low: float, high: float) -> Latency:
+    return lambda: random.uniform(low, high)
+
+
+def lognormal(median: float, sigma: float = 1.0) -> Latency:
+    """
+    Log-normally distributed latencies, giving the heavy tail typical for
+    catalogue servers.
+    """
+    mu = math.log(median)
+    return lambda: random.lognormvariate(mu, sigma)
+
+
+@dataclass
+class Item:
+    id: str
+    title: str
+    subjects: List[str]
+    contributor: str
+    updated: datetime
+
+
+class MockServer:
+    def __init__(self, total_results: int = 1000, description: Optional[Description] = None,
+                 latency: Optional[Latency] = None, error_rate: float = 0.0,
+                 error_status: int = 503, retry_after: Optional[float] = None,
+                 summary_size: int = 200, max_count: int = 100, default_count: int = 10,
+                 newest_first: bool = False, time_restriction: bool = False,
+                 host: str = "127.0.0.1", port: int = 0, seed: int = 0):
+        self.description = description
+        self.latency = latency
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self.summary_size = summary_size
+        self.max_count = max_count
+        self.default_count = default_count
+        self.newest_first = newest_first
+        self.time_restriction = time_restriction
+        self.host = host
+        self.port = port
+        self.random = random.Random(seed)
+
+        epoch = datetime(2020, 1, 1, tzinfo=timezone.utc)
+        self.items = [
+            Item(
+                id=f"urn:mock:{i}",
+                title=f"{WORDS[i % len(WORDS)]} product {i}",
+                subjects=[WORDS[i % len(WORDS)], THEMES[i % len(THEMES)], "Satellite_Data"],
+                contributor=PROVIDERS[i % len(PROVIDERS)],
+                updated=epoch + timedelta(hours=i),
+            )
+            for i in range(total_results)
+        ]
+        self.requests = 0
+        self.errors = 0
+        self._server: Optional[asyncio.AbstractServer] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://{self.host}:{self.port}"
+
+    def default_description(self) -> Description:
+        return Description(
+            short_name="Mock",
+            description="Local OpenSearch stand-in server",
+            urls=[
+                Url(
+                    template=(
+                        f"{self.url}/search?q={{searchTerms?}}"
+                        "&startIndex={startIndex?}&count={count?}"
+                        + ("&start={time:start?}" if self.time_restriction else "")
+                    ),
+                    type="application/atom+xml",
+                    parameters=[
+                        Parameter(name="q", value="{searchTerms}", minimum=0),
+                        Parameter(name="startIndex", value="{startIndex}", minimum=0),
+                        Parameter(
+                            name="count", value="{count}", minimum=0,
+                            min_inclusive=1, max_inclusive=self.max_count,
+                        ),
+                    ],
+                ),
+            ],
+        )
+
+    async def start(self) -> "MockServer":
+        self._server = await asyncio.start_server(self._handle, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        if self.description is None:
+            self.description = self.default_description()
+        return self
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockServer":
+        return await self.start()
+
+    async def __aexit__(self, *args) -> None:
+        await self.stop()
+
+    async def _handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                try:
+                    head = await reader.readuntil(b"\r\n\r\n")
+                except asyncio.IncompleteReadError:
+                    break
+                request_line, *header_lines = head.decode("latin-1").split("\r\n")
+                method, target, _ = request_line.split(" ", 2)
+                headers = {}
+                for line in header_lines:
+                    if ":" in line:
+                        name, value = line.split(":", 1)
+                        headers[name.strip().lower()] = value.strip()
+                if "content-length" in headers:
+                    await reader.readexactly(int(headers["content-length"]))
+
+                status, extra_headers, body = await self.respond(method, target)
+                writer.write(self._encode_response(status, extra_headers, body))
+                await writer.drain()
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except ConnectionError:
+            pass
+        finally:
+            writer.close()
+
+    @staticmethod
+    def _encode_response(status: int, headers: Dict[str, str], body: bytes) -> bytes:
+        lines = [f"HTTP/1.1 {status} {REASONS.get(status, 'Unknown')}"]
+        lines.extend(f"{name}: {value}" for name, value in headers.items())
+        lines.append(f"Content-Length: {len(body)}")
+        return ("\r\n".join(lines) + "\r\n\r\n").encode("latin-1") + body
+
+    async def respond(self, method: str, target: str) -> Tuple[int, Dict[str, str], bytes]:
+        """
+        Produces the status, headers and body for a request.
+        """
+        self.requests += 1
+        if self.latency is not None:
+            await asyncio.sleep(max(0.0, self.latency()))
+
+        parsed = urlsplit(target)
+        if self.error_rate and self.random.random() < self.error_rate:
+            self.errors += 1
+            headers = {}
+            if self.retry_after is not None:
+                headers["Retry-After"] = str(self.retry_after)
+            return self.error_status, headers, b""
+
+        if parsed.path == "/description.xml":
+            assert self.description is not None
+            return 200, {"Content-Type": "application/opensearchdescription+xml"}, tostring(
+                encode_osdd11(self.description), xml_declaration=True, encoding="UTF-8"
+            )
+        if parsed.path == "/search":
+            query = {key: values[0] for key, values in parse_qs(parsed.query).items()}
+            try:
+                start_index = int(query.get("startIndex") or 1)
+                count = int(query.get("count") or self.default_count)
+                since = (
+                    parse_datetime(query["start"])
+                    if self.time_restriction and query.get("start") else None
+                )
+            except ValueError:
+                return 400, {}, b""
+            return 200, {"Content-Type": "application/atom+xml"}, self.feed(
+                query.get("q"), start_index, count, since
+            )
+        return 404, {}, b""
+
+    def search(self, search_terms: Optional[str], since: Optional[datetime] = None) -> List[Item]:
+        terms = search_terms.lower().split() if search_terms else []
+        results = [
+            item for item in self.items
+            if all(term in item.title for term in terms)
+            and (since is None or item.updated >= since)
+        ]
+        if self.newest_first:
+            results.sort(key=lambda item: item.updated, reverse=True)
+        return results
+
+    def feed(self, search_terms: Optional[str], start_index: int, count: int,
+             since: Optional[datetime] = None) -> bytes:
+        """
+        Encodes the page of results for ``search_terms`` as an Atom feed.
+        """
+        count = max(0, min(count, self.max_count))
+        results = self.search(search_terms, since)
+        page = results[max(0, start_index - 1):max(0, start_index - 1) + count]
+        summary = ("lorem ipsum " * (self.summary_size // 12 + 1))[:self.summary_size]
+
+        def link(rel: str, index: int):
+            return ATOM(
+                "link", rel=rel, type="application/atom+xml",
+                href=f"{self.url}/search?" + urlencode(
+                    {"q": search_terms or "", "startIndex": index, "count": count}
+                ),
+            )
+
+        return tostring(ATOM(
+            "feed",
+            ATOM("title", "Mock search results"),
+            ATOM("id", f"{self.url}/search"),
+            ATOM("updated", datetime.now(timezone.utc).isoformat()),
+            OS("totalResults", str(len(results))),
+            OS("startIndex", str(start_index)),
+            OS("itemsPerPage", str(count)),
+            link("next", start_index + count) if start_index + count <= len(results) else None,
+            link("previous", max(1, start_index - count)) if start_index > 1 else None,
+            *[
+                ATOM(
+                    "entry",
+                    ATOM("title", item.title),
+                    ATOM("id", item.id),
+                    DC("identifier", item.id),
+                    ATOM("updated", item.updated.isoformat()),
+                    *[ATOM("category", term=subject) for subject in item.subjects],
+                    ATOM("summary", summary),
+                    ATOM("contributor", item.contributor),
+                    ATOM("language", "en"),
+                    ATOM("rights", "CC-BY-4.0"),
+                )
+                for item in page
+            ]
+        ), xml_declaration=True, encoding="UTF-8")
@@ -1,10 +1,10 @@
+import threading
 from datetime import datetime
-from typing import Callable, Optional, TypeVar
-
-import iso8601
+from typing import Callable, Dict, Iterable, Optional, Sequence, Tuple, TypeVar
 
 
 T = TypeVar("T")
+K = TypeVar("K", str, Tuple[str, ...])
 
 
 def unwrap(raw: Optional[str], parser: Callable[[str], T], default: Optional[T] = None) -> Optional[T]:
@@ -20,4 +20,59 @@ def unwrap_default(raw: Optional[str], parser: Callable[[str], T], default: T) -
 
 
 def parse_datetime(raw: str) -> datetime:
+    import iso8601  # deferred: only needed once dates are actually parsed
+
     return iso8601.parse_date(raw)
+
+
+class InternTable:
+    """
+    Deduplicates repeated strings, and optionally sequences of strings, so
+    that equal values share a single object. The table stops growing after
+    ``maxsize`` distinct entries; values not in the table are then returned
+    as they are. With ``tuples``, :meth:`values` returns (interned) tuples
+    instead of fresh lists. Tables can be shared between threads: lookups are
+    plain dictionary reads, insertions are serialized by a lock.
+    """
+    def __init__(self, maxsize: int = 65536, tuples: bool = False):
+        self.maxsize = maxsize
+        self.tuples = tuples
+        self.strings: Dict[str, str] = {}
+        self.sequences: Dict[Tuple[str, ...], Tuple[str, ...]] = {}
+        self.lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self.strings) + len(self.sequences)
+
+    def __call__(self, value: Optional[str]) -> Optional[str]:
+        if value is None:
+            return None
+        return self.intern(value)
+
+    def intern(self, value: str) -> str:
+        try:
+            return self.strings[value]
+        except KeyError:
+            return self._insert(self.strings, value)
+
+    def values(self, values: Iterable[str]) -> Sequence[str]:
+        if not self.tuples:
+            return [self.intern(value) for value in values]
+        key = tuple(self.intern(value) for value in values)
+        try:
+            return self.sequences[key]
+        except KeyError:
+            return self._insert(self.sequences, key)
+
+    def _insert(self, table: Dict[K, K], value: K) -> K:
+        if len(self) >= self.maxsize:
+            # full: do not contend for the lock on every miss
+            return value
+        with self.lock:
+            # another thread may have inserted the value in the meantime
+            existing = table.get(value)
+            if existing is not None:
+                return existing
+            if len(self) < self.maxsize:
+                table[value] = value
+            return value
@@ -1,11 +1,34 @@
-from io import BytesIO
+import mmap
+import os
+import threading
 from typing import BinaryIO, Callable, Optional, Tuple, TypeVar, Union
 
-from lxml.etree import QName, parse, _Element as Element, _ElementTree as ElementTree
+from lxml.etree import (
+    QName, XMLParser, fromstring, parse, _Element as Element, _ElementTree as ElementTree
+)
 from lxml.builder import ElementMaker as LxmlElementMaker
 
 
-__all__ = ["ElementMaker", "Element", "parse_xml"]
+__all__ = ["ElementMaker", "Element", "XmlSource", "get_parser", "parse_xml"]
+
+
+# file objects, in-memory buffers or filesystem paths
+XmlSource = Union[BinaryIO, bytes, bytearray, memoryview, mmap.mmap, str, "os.PathLike[str]"]
+BUFFER_TYPES = (bytearray, memoryview, mmap.mmap)
+# size of the pieces buffers are fed to the parser in, on lxml < 6
+FEED_CHUNK_SIZE = 1 << 20
+
+
+def _fromstring_accepts_buffers() -> bool:
+    # lxml >= 6 parses any buffer; older versions only accept bytes and str
+    try:
+        fromstring(memoryview(b"<a/>"))
+    except ValueError:
+        return False
+    return True
+
+
+FROMSTRING_ACCEPTS_BUFFERS = _fromstring_accepts_buffers()
 
 
 class ElementMaker(LxmlElementMaker):
@@ -19,10 +42,60 @@ class ElementMaker(LxmlElementMaker):
         return super().__call__(tag, *children, **attrib)
 
 
-def parse_xml(source: Union[BinaryIO, bytes], expected_root_tag: Optional[Tuple[str, str]] = None) -> Element:
-    if isinstance(source, bytes):
-        source = BytesIO(source)
-    tree: Union[Element, ElementTree] = parse(source)
+_local = threading.local()
+
+
+def get_parser(huge_tree: bool = False) -> XMLParser:
+    """
+    The hardened parser of the current thread: DTDs are neither loaded nor
+    validated, entities are not resolved and no network access is allowed.
+    Parsers are not thread safe, so each thread keeps its own instances.
+    """
+    parsers = getattr(_local, "parsers", None)
+    if parsers is None:
+        parsers = _local.parsers = {}
+    try:
+        return parsers[huge_tree]
+    except KeyError:
+        parser = parsers[huge_tree] = XMLParser(
+            load_dtd=False,
+            dtd_validation=False,
+            resolve_entities=False,
+            no_network=True,
+            remove_blank_text=True,
+            huge_tree=huge_tree,
+        )
+        return parser
+
+
+def parse_xml(source: XmlSource, expected_root_tag: Optional[Tuple[str, str]] = None,
+              huge_tree: bool = False) -> Element:
+    """
+    Parses the XML document in ``source``. Buffers (including ``mmap`` and
+    ``memoryview`` objects) are handed to lxml without copying (on lxml < 6
+    they are fed to the parser in chunks), paths are read by libxml2
+    directly. ``huge_tree`` lifts libxml2's limits on the document
+    depth and text node sizes, for oversized, trusted, documents only.
+    """
+    parser = get_parser(huge_tree)
+    tree: Union[Element, ElementTree]
+    if isinstance(source, bytes) or (
+        FROMSTRING_ACCEPTS_BUFFERS and isinstance(source, BUFFER_TYPES)
+    ):
+        tree = fromstring(source, parser)
+    elif isinstance(source, BUFFER_TYPES):
+        # copy the buffer piecewise instead of as a whole
+        view = memoryview(source)
+        try:
+            for offset in range(0, len(view), FEED_CHUNK_SIZE):
+                parser.feed(view[offset:offset + FEED_CHUNK_SIZE].tobytes())
+            tree = parser.close()
+        finally:
+            view.release()
+    elif isinstance(source, (str, os.PathLike)):
+        tree = parse(os.fspath(source), parser)
+    else:
+        tree = parse(source, parser)
     root = tree if isinstance(tree, Element) else tree.getroot()
 
     if expected_root_tag and QName(root) != QName(*expected_root_tag):
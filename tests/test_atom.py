@@ -1,8 +1,13 @@
+import mmap
+import pathlib
+from concurrent.futures import ThreadPoolExecutor
 from os.path import dirname, join
 from datetime import datetime, timezone
 
-from opynsearch.atom import parse_atom_feed
+from opynsearch.atom import parse_atom_feed, parse_atom_feeds
 from opynsearch.result import SearchResultPage, SearchResultItem
+from opynsearch.utils import InternTable
+from opynsearch.xml import get_parser
 
 
 def test_parse():
@@ -63,4 +68,105 @@ def test_parse():
         language=None,
         rights="Copyright",
         envelopes=[]
-    )
\ No newline at end of file
+    )
+
+def test_parse_interned():
+    with open(join(dirname(__file__), "data/atom.xml"), "rb") as f:
+        data = f.read()
+    intern = InternTable(tuples=True)
+    first = parse_atom_feed(data, intern=intern)
+    second = parse_atom_feed(data, intern=intern)
+
+    assert first == second
+    item, other = first.items[0], second.items[0]
+    assert item.subjects == (
+        "climatologyMeteorologyAtmosphere",
+        "Observation",
+        "Marine",
+        "Satellite_Data",
+        "Sea_Ice"
+    )
+    assert item.subjects is other.subjects
+    assert item.rights is other.rights
+
+
+def test_intern_table_is_bounded():
+    intern = InternTable(maxsize=2)
+    assert intern(None) is None
+    for value in ["a", "b", "c"]:
+        intern("".join([value]))
+    assert len(intern) == 2
+    assert intern.values(["a", "b"]) == ["a", "b"]
+    # misses on a full table do not take the lock
+    intern.lock = None
+    assert intern("d") == "d"
+
+
+def test_parse_sources():
+    path = join(dirname(__file__), "data/atom.xml")
+    with open(path, "rb") as f:
+        expected = parse_atom_feed(f)
+        f.seek(0)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            assert parse_atom_feed(mapped) == expected
+            assert parse_atom_feed(memoryview(mapped)) == expected
+            assert parse_atom_feed(mapped, huge_tree=True) == expected
+
+    assert parse_atom_feed(path) == expected
+    assert parse_atom_feed(pathlib.Path(path)) == expected
+
+
+FEED = """<?xml version="1.0"?>
+<!DOCTYPE feed [<!ENTITY xxe SYSTEM "file://{path}">]>
+<feed xmlns="http://www.w3.org/2005/Atom"
+    xmlns:os="http://a9.com/-/spec/opensearch/1.1/">
+  <title>{title}</title>
+  <id>feed</id>
+  <os:totalResults>0</os:totalResults>
+  <os:startIndex>1</os:startIndex>
+  <os:itemsPerPage>10</os:itemsPerPage>
+</feed>"""
+
+
+def test_parse_does_not_resolve_external_entities(tmp_path):
+    secret = tmp_path / "secret.txt"
+    secret.write_text("secret")
+    page = parse_atom_feed(FEED.format(path=secret, title="&xxe;").encode())
+    assert "secret" not in (page.title or "")
+
+
+def test_parsers_are_reused_per_thread():
+    assert get_parser() is get_parser()
+    assert get_parser(huge_tree=True) is not get_parser()
+
+    with ThreadPoolExecutor(1) as executor:
+        other = executor.submit(get_parser).result()
+    assert other is not get_parser()
+
+
+def test_parse_atom_feeds():
+    feeds = [FEED.format(path="/dev/null", title=i).encode() for i in range(20)]
+    pages = parse_atom_feeds(feeds, max_workers=4)
+    assert [page.title for page in pages] == [str(i) for i in range(20)]
+
+
+def test_parse_buffers_fed_in_chunks(monkeypatch):
+    import opynsearch.xml
+
+    monkeypatch.setattr(opynsearch.xml, "FROMSTRING_ACCEPTS_BUFFERS", False)
+    monkeypatch.setattr(opynsearch.xml, "FEED_CHUNK_SIZE", 64)
+    path = join(dirname(__file__), "data/atom.xml")
+    with open(path, "rb") as f:
+        data = f.read()
+    expected = parse_atom_feed(data)
+    assert parse_atom_feed(bytearray(data)) == expected
+    assert parse_atom_feed(memoryview(data)) == expected
+
+
+def test_parse_atom_feeds_shared_intern_table():
+    with open(join(dirname(__file__), "data/atom.xml"), "rb") as f:
+        data = f.read()
+    intern = InternTable(tuples=True)
+    pages = parse_atom_feeds([data] * 20, max_workers=4, intern=intern)
+    subjects = {id(page.items[0].subjects) for page in pages}
+    assert len(subjects) == 1
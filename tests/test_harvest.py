@@ -0,0 +1,93 @@
+import asyncio
+from datetime import timedelta
+
+from opynsearch.description import Url
+from opynsearch.harvest import HarvestState, harvest_delta, time_restriction
+from opynsearch.testing import MockServer
+
+
+def harvest(server, state, **kwargs):
+    requests = []
+
+    async def fetch(start_index, count, since):
+        requests.append((start_index, since))
+        return server.feed(None, start_index, count, since)
+
+    async def run():
+        return [item.id async for item in harvest_delta(fetch, state, count=20, **kwargs)]
+
+    return asyncio.run(run()), requests
+
+
+def touch(server, *indices):
+    newest = max(item.updated for item in server.items)
+    for offset, index in enumerate(indices, 1):
+        server.items[index].updated = newest + timedelta(minutes=offset)
+
+
+def test_time_restriction():
+    assert time_restriction(Url(template="http://a.test/?q={searchTerms}&s={time:start?}", type=""))
+    assert time_restriction(Url(template="http://a.test/?s={t:start}", type=""))
+    assert not time_restriction(Url(template="http://a.test/?q={searchTerms}", type=""))
+    server = MockServer(time_restriction=True)
+    assert time_restriction(server.default_description().urls[0])
+
+
+def test_harvest_stops_at_watermark(tmp_path):
+    path = str(tmp_path / "state.json")
+    server = MockServer(total_results=200, newest_first=True)
+
+    state = HarvestState.load(path)
+    items, requests = harvest(server, state)
+    assert len(items) == 200
+    assert len(requests) == 10
+    assert state.watermark == max(item.updated for item in server.items)
+    state.save(path)
+
+    state = HarvestState.load(path)
+    items, requests = harvest(server, state)
+    assert items == []
+    assert len(requests) == 1
+
+    touch(server, 5, 150)
+    items, requests = harvest(server, state)
+    assert sorted(items) == ["urn:mock:150", "urn:mock:5"]
+    assert len(requests) == 1
+
+
+def test_harvest_time_restricted():
+    server = MockServer(total_results=200, time_restriction=True)
+    state = HarvestState()
+    items, requests = harvest(server, state, time_restricted=True)
+    assert len(items) == 200
+    assert requests[0][1] is None
+
+    touch(server, 1, 2, 3)
+    items, requests = harvest(server, state, time_restricted=True)
+    assert sorted(items) == ["urn:mock:1", "urn:mock:2", "urn:mock:3"]
+    assert len(requests) == 1
+    assert requests[0][1] == state.watermark - timedelta(minutes=3)
+
+
+def test_harvest_unordered_emits_delta_only():
+    server = MockServer(total_results=100)
+    state = HarvestState()
+    harvest(server, state, newest_first=False)
+
+    touch(server, 42)
+    items, requests = harvest(server, state, newest_first=False)
+    assert items == ["urn:mock:42"]
+    assert len(requests) == 5
+
+
+def test_state_roundtrip(tmp_path):
+    path = str(tmp_path / "state.json")
+    state = HarvestState(seen=[3, 1, 5])
+    state.recent.update([6, 2, 4])
+    assert 4 in state and 5 in state and 7 not in state
+    assert len(state) == 6
+    state.save(path)
+
+    loaded = HarvestState.load(path)
+    assert list(loaded.digests) == [1, 2, 3, 4, 5, 6]
+    assert not loaded.recent
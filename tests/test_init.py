@@ -0,0 +1,41 @@
+import subprocess
+import sys
+
+import pytest
+
+import opynsearch
+
+
+def _loaded_modules(code: str):
+    output = subprocess.check_output([
+        sys.executable, "-c",
+        f"import sys\n{code}\nprint('\\n'.join(sorted(sys.modules)))",
+    ])
+    return set(output.decode().split())
+
+
+def test_import_is_lightweight():
+    modules = _loaded_modules("import opynsearch; opynsearch.Description")
+    assert "opynsearch.description" in modules
+    assert not {"lxml", "pygml", "iso8601", "httpx"} & modules
+
+
+def test_atom_defers_optional_parsers():
+    modules = _loaded_modules("import opynsearch.atom")
+    assert not {"pygml", "iso8601"} & modules
+
+
+def test_lazy_attributes():
+    from opynsearch.atom import parse_atom_feed
+    from opynsearch.description import Description
+
+    assert opynsearch.parse_atom_feed is parse_atom_feed
+    assert opynsearch.Description is Description
+    assert "parse_osdd11" in dir(opynsearch)
+    assert set(opynsearch.__all__) <= set(dir(opynsearch))
+    assert not {"Any", "TYPE_CHECKING", "import_module"} & set(dir(opynsearch))
+
+
+def test_unknown_attribute():
+    with pytest.raises(AttributeError):
+        opynsearch.does_not_exist
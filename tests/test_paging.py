@@ -0,0 +1,160 @@
+import asyncio
+
+from opynsearch.description import Parameter, Url
+from opynsearch.paging import PageSizeStore, PageSizeTuner, count_bounds, paginate
+
+
+def latency_model(count):
+    # fixed round trip overhead plus a superlinear per-page cost
+    return 0.2 + 0.001 * count + 0.00001 * count ** 2
+
+
+def tune(tuner, pages=30):
+    for _ in range(pages):
+        count = tuner.next_count()
+        tuner.observe(count, count, latency_model(count), count * 1000)
+    return tuner
+
+
+def test_count_bounds():
+    url = Url(
+        template="http://example.com/?q={searchTerms}&c={count}",
+        type="application/atom+xml",
+        parameters=[
+            Parameter(name="q", value="{searchTerms}"),
+            Parameter(name="c", value="{count}", min_inclusive=5, max_inclusive=50),
+        ]
+    )
+    assert count_bounds(url) == (5, 50)
+    assert count_bounds(Url(template="", type="")) == (1, 1000)
+
+
+def test_converges_near_best_throughput():
+    tuner = tune(PageSizeTuner(maximum=1000))
+    assert tuner.converged
+    # the throughput of the model peaks at about 141 items per page
+    assert 100 <= tuner.best <= 200
+    assert tuner.next_count() == tuner.best
+
+
+def test_respects_limits():
+    tuner = tune(PageSizeTuner(minimum=5, maximum=50))
+    assert tuner.best == 50
+
+    tuner = tune(PageSizeTuner(max_latency=0.3))
+    assert latency_model(tuner.best) <= 0.3
+
+    tuner = tune(PageSizeTuner(max_bytes=40000))
+    assert tuner.best <= 40
+
+
+def test_server_capped_page_size():
+    tuner = PageSizeTuner(initial=100)
+    tuner.observe(100, 25, 0.1, 1000, items_per_page=25)
+    assert tuner.maximum == 25
+    assert tuner.next_count() <= 25
+
+
+def test_short_last_page_does_not_cap():
+    tuner = PageSizeTuner(initial=10)
+    tuner.observe(10, 10, 0.2, 1000, items_per_page=10)
+    tuner.observe(20, 20, 0.2, 2000, items_per_page=20)
+    tuner.observe(40, 3, 0.3, 300, items_per_page=3, last=True)
+    assert tuner.maximum == 1000
+    assert not tuner.converged
+    assert tuner.next_count() == 40
+
+
+def test_store(tmp_path):
+    path = str(tmp_path / "sizes.json")
+    url = Url(template="http://example.com/?c={count}", type="application/atom+xml")
+    tuner = tune(PageSizeTuner.from_url(url, store=PageSizeStore(path)))
+
+    reused = PageSizeTuner.from_url(url, store=PageSizeStore(path))
+    assert reused.converged
+    assert reused.next_count() == tuner.best
+
+
+def make_feed(start_index, count, total, report_actual=False):
+    indices = range(start_index, min(start_index + count, total + 1))
+    entries = "".join(f"<entry><title>{i}</title><id>{i}</id></entry>" for i in indices)
+    if report_actual:
+        # some servers report the number of items on the page, not the count
+        count = len(indices)
+    return f"""<feed xmlns="http://www.w3.org/2005/Atom"
+        xmlns:os="http://a9.com/-/spec/opensearch/1.1/">
+      <title>results</title><id>feed</id>
+      <os:totalResults>{total}</os:totalResults>
+      <os:startIndex>{start_index}</os:startIndex>
+      <os:itemsPerPage>{count}</os:itemsPerPage>
+      {entries}
+    </feed>""".encode()
+
+
+def test_paginate():
+    requests = []
+
+    async def fetch(start_index, count):
+        requests.append((start_index, count))
+        return make_feed(start_index, count, 25)
+
+    async def run():
+        return [page async for page in paginate(fetch, count=10)]
+
+    pages = asyncio.run(run())
+    assert requests == [(1, 10), (11, 10), (21, 10)]
+    assert [item.id for page in pages for item in page.items] == [
+        str(i) for i in range(1, 26)
+    ]
+
+
+def test_paginate_tuned():
+    requests = []
+
+    async def fetch(start_index, count):
+        requests.append(count)
+        await asyncio.sleep(0.01 + 0.0001 * count)
+        return make_feed(start_index, count, 500)
+
+    async def run():
+        tuner = PageSizeTuner(initial=10, maximum=100)
+        return [page async for page in paginate(fetch, tuner)]
+
+    pages = asyncio.run(run())
+    assert sum(len(page.items) for page in pages) == 500
+    assert requests[:2] == [10, 20]
+
+
+def test_from_url_bounds():
+    url = Url(
+        template="http://example.com/?c={count}",
+        type="application/atom+xml",
+        parameters=[
+            Parameter(name="c", value="{count}", min_inclusive=5, max_inclusive=50),
+        ]
+    )
+    tuner = PageSizeTuner.from_url(url, minimum=20, maximum=40)
+    assert (tuner.minimum, tuner.maximum) == (20, 40)
+
+    tuner = PageSizeTuner.from_url(url, minimum=2)
+    assert (tuner.minimum, tuner.maximum) == (5, 50)
+
+
+def test_paginate_tuned_short_last_page():
+    requests = []
+
+    async def fetch(start_index, count):
+        requests.append(count)
+        await asyncio.sleep(0.01 + 0.0001 * count)
+        return make_feed(start_index, count, 33, report_actual=True)
+
+    async def run():
+        tuner = PageSizeTuner(initial=10, maximum=100, store=PageSizeStore(), endpoint="e")
+        pages = [page async for page in paginate(fetch, tuner)]
+        return tuner, pages
+
+    tuner, pages = asyncio.run(run())
+    assert sum(len(page.items) for page in pages) == 33
+    assert requests == [10, 20, 40]
+    assert tuner.maximum == 100
+    assert tuner.store.get("e") is None
@@ -0,0 +1,216 @@
+import asyncio
+import time
+from contextlib import asynccontextmanager
+
+import httpx
+import pytest
+
+from opynsearch.policy import HedgePolicy, LatencyTracker, RequestPolicy, RetryPolicy
+
+
+@asynccontextmanager
+async def stand_in_server(script):
+    """
+    Minimal HTTP server answering the n-th request after ``script(n)``
+    returns a ``(latency, status_code)`` pair.
+    """
+    requests = []
+
+    async def handle(reader, writer):
+        try:
+            while True:
+                head = await reader.readuntil(b"\r\n\r\n")
+                requests.append(head.split(b" ", 2)[1].decode())
+                latency, status_code = script(len(requests) - 1)
+                await asyncio.sleep(latency)
+                body = b"ok"
+                writer.write(
+                    b"HTTP/1.1 %d X\r\nContent-Length: %d\r\n\r\n%s"
+                    % (status_code, len(body), body)
+                )
+                await writer.drain()
+        except (asyncio.IncompleteReadError, ConnectionError):
+            pass
+        finally:
+            writer.close()
+
+    server = await asyncio.start_server(handle, "127.0.0.1", 0)
+    port = server.sockets[0].getsockname()[1]
+    try:
+        async with httpx.AsyncClient(base_url=f"http://127.0.0.1:{port}") as client:
+            yield client, requests
+    finally:
+        server.close()
+        await server.wait_closed()
+
+
+def test_latency_tracker():
+    tracker = LatencyTracker(window=100)
+    with pytest.raises(ValueError):
+        tracker.quantile(0.5)
+    for i in range(1, 101):
+        tracker.add(i / 100)
+    assert tracker.quantile(0.95) == 0.96
+    assert tracker.quantile(1.0) == 1.0
+
+
+def test_retry_delay_is_jittered_and_capped():
+    retry = RetryPolicy(backoff=1.0, max_backoff=4.0)
+    delays = [retry.delay(10) for _ in range(100)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 1
+
+
+def test_retry_attempts_are_validated():
+    with pytest.raises(ValueError):
+        RetryPolicy(attempts=0)
+
+
+def test_retries_idempotent_requests():
+    policy = RequestPolicy(retry=RetryPolicy(attempts=3, backoff=0.01))
+
+    async def run():
+        async with stand_in_server(lambda n: (0, 503 if n < 2 else 200)) as (client, requests):
+            response = await policy.execute(lambda: client.get("/search"))
+            return response, requests
+
+    response, requests = asyncio.run(run())
+    assert response.status_code == 200
+    assert len(requests) == 3
+    assert policy.retries == 2
+
+
+def test_gives_up_after_attempts():
+    policy = RequestPolicy(retry=RetryPolicy(attempts=2, backoff=0.01))
+
+    async def run():
+        async with stand_in_server(lambda n: (0, 503)) as (client, requests):
+            return await policy.execute(lambda: client.get("/search")), requests
+
+    response, requests = asyncio.run(run())
+    assert response.status_code == 503
+    assert len(requests) == 2
+
+
+def test_does_not_retry_post():
+    policy = RequestPolicy(retry=RetryPolicy(attempts=3, backoff=0.01))
+
+    async def run():
+        async with stand_in_server(lambda n: (0, 503)) as (client, requests):
+            response = await policy.execute(lambda: client.post("/search"), method="POST")
+            return response, requests
+
+    response, requests = asyncio.run(run())
+    assert response.status_code == 503
+    assert len(requests) == 1
+
+
+def test_hedging_cuts_tail_latency():
+    policy = RequestPolicy(hedge=HedgePolicy(initial_delay=0.05))
+
+    async def run():
+        # the first request hits the latency tail, its duplicate does not
+        async with stand_in_server(lambda n: (2.0 if n == 0 else 0.01, 200)) as (client, requests):
+            start = time.monotonic()
+            response = await policy.execute(lambda: client.get("/search"))
+            return response, time.monotonic() - start, requests
+
+    response, elapsed, requests = asyncio.run(run())
+    assert response.status_code == 200
+    assert elapsed < 1.0
+    assert len(requests) == 2
+    assert policy.hedges == 1
+
+
+def test_hedge_delay_follows_observed_latency():
+    policy = RequestPolicy(hedge=HedgePolicy(min_samples=5, initial_delay=10.0))
+
+    async def run():
+        async with stand_in_server(lambda n: (0.01 if n < 5 else (2.0 if n == 5 else 0.01), 200)) as (client, requests):
+            for _ in range(5):
+                await policy.execute(lambda: client.get("/search"))
+            start = time.monotonic()
+            await policy.execute(lambda: client.get("/search"))
+            return time.monotonic() - start
+
+    assert asyncio.run(run()) < 1.0
+    assert policy.hedges == 1
+
+
+def test_deadline_cancels_outstanding_requests():
+    policy = RequestPolicy(
+        retry=RetryPolicy(attempts=5, backoff=0.01),
+        hedge=HedgePolicy(initial_delay=0.02),
+        deadline=0.2,
+    )
+
+    async def run():
+        async with stand_in_server(lambda n: (5.0, 200)) as (client, requests):
+            start = time.monotonic()
+            with pytest.raises(asyncio.TimeoutError):
+                await policy.execute(lambda: client.get("/search"))
+            return time.monotonic() - start, requests
+
+    elapsed, requests = asyncio.run(run())
+    assert elapsed < 1.0
+    assert len(requests) == 2
+
+
+def test_does_not_retry_programming_errors():
+    policy = RequestPolicy(retry=RetryPolicy(attempts=3, backoff=0.01))
+    calls = []
+
+    async def send():
+        calls.append(None)
+        raise TypeError()
+
+    with pytest.raises(TypeError):
+        asyncio.run(policy.execute(send))
+    assert len(calls) == 1
+
+
+def test_retries_transport_errors():
+    policy = RequestPolicy(retry=RetryPolicy(attempts=3, backoff=0.01))
+    calls = []
+
+    async def send():
+        calls.append(None)
+        if len(calls) < 3:
+            raise httpx.ConnectError("refused")
+        return "ok"
+
+    assert asyncio.run(policy.execute(send)) == "ok"
+    assert len(calls) == 3
+
+
+def test_hedged_away_attempts_are_sampled():
+    policy = RequestPolicy(hedge=HedgePolicy(initial_delay=0.05))
+
+    async def run():
+        async with stand_in_server(lambda n: (0.5 if n == 0 else 0.01, 200)) as (client, requests):
+            await policy.execute(lambda: client.get("/search"))
+
+    asyncio.run(run())
+    # the winning duplicate and the cancelled slow attempt
+    assert len(policy.latencies) == 2
+    assert policy.latencies.quantile(1.0) >= 0.05
+
+
+def test_hedged_away_attempts_are_awaited():
+    policy = RequestPolicy(hedge=HedgePolicy(initial_delay=0.02))
+    finished = []
+
+    async def send(latency):
+        try:
+            await asyncio.sleep(latency)
+            return latency
+        finally:
+            finished.append(latency)
+
+    async def run():
+        latencies = iter([5.0, 0.01])
+        response = await policy.execute(lambda: send(next(latencies)))
+        # the slow attempt was cancelled and wound down before execute returned
+        return response, sorted(finished)
+
+    assert asyncio.run(run()) == (0.01, [0.01, 5.0])
@@ -0,0 +1,138 @@
+import asyncio
+import time
+from collections import namedtuple
+from datetime import datetime, timezone
+
+import pytest
+
+from opynsearch.scheduler import (
+    HostLimits, RateLimit, Scheduler, TokenBucket, parse_retry_after
+)
+
+
+Response = namedtuple("Response", ["status_code", "headers"])
+
+
+def make_send(status_code=200, headers=None, delay=0.0, active=None):
+    async def send():
+        if active is not None:
+            active["now"] += 1
+            active["max"] = max(active["max"], active["now"])
+        try:
+            await asyncio.sleep(delay)
+        finally:
+            if active is not None:
+                active["now"] -= 1
+        return Response(status_code, headers or {})
+    return send
+
+
+def test_token_bucket():
+    now = [0.0]
+    bucket = TokenBucket(2.0, burst=2, clock=lambda: now[0])
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == 0.0
+    assert bucket.reserve() == pytest.approx(0.5)
+    assert bucket.reserve() == pytest.approx(1.0)
+    now[0] = 10.0
+    assert bucket.reserve() == 0.0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after(None) is None
+    assert parse_retry_after("3") == 3.0
+    assert parse_retry_after(
+        "Wed, 21 Oct 2015 07:28:10 GMT",
+        now=datetime(2015, 10, 21, 7, 28, tzinfo=timezone.utc),
+    ) == 10.0
+    assert parse_retry_after("garbage") is None
+
+
+def test_concurrency_limit_is_respected():
+    scheduler = Scheduler(HostLimits(initial_concurrency=3, max_concurrency=3))
+    active = {"now": 0, "max": 0}
+
+    async def run():
+        await asyncio.gather(*[
+            scheduler.request("http://a.test/", make_send(delay=0.01, active=active))
+            for _ in range(20)
+        ])
+
+    asyncio.run(run())
+    assert active["max"] == 3
+    metrics = scheduler.metrics()["a.test"]
+    assert metrics.requests == 20
+    assert metrics.in_flight == 0
+    assert metrics.queued == 0
+
+
+def test_additive_increase():
+    scheduler = Scheduler(HostLimits(initial_concurrency=1, max_concurrency=8))
+
+    async def run():
+        for _ in range(10):
+            await scheduler.request("http://a.test/", make_send())
+
+    asyncio.run(run())
+    assert scheduler.metrics()["a.test"].concurrency_limit > 1
+
+
+def test_multiplicative_decrease_and_retry_after():
+    scheduler = Scheduler(HostLimits(initial_concurrency=8))
+
+    async def run():
+        await scheduler.request(
+            "http://a.test/", make_send(429, {"Retry-After": "0.2"})
+        )
+        metrics = scheduler.metrics()["a.test"]
+        assert metrics.concurrency_limit == 4
+        assert metrics.throttled == 1
+        assert metrics.retry_after > 0.1
+
+        start = time.monotonic()
+        await scheduler.request("http://a.test/", make_send())
+        assert time.monotonic() - start >= 0.15
+
+    asyncio.run(run())
+
+
+def test_errors_decrease():
+    scheduler = Scheduler(HostLimits(initial_concurrency=8))
+
+    async def failing():
+        raise ConnectionError()
+
+    async def run():
+        with pytest.raises(ConnectionError):
+            await scheduler.request("http://a.test/", failing)
+
+    asyncio.run(run())
+    metrics = scheduler.metrics()["a.test"]
+    assert metrics.errors == 1
+    assert metrics.concurrency_limit == 4
+
+
+def test_rate_limit_per_host():
+    scheduler = Scheduler(hosts={
+        "slow.test": HostLimits(rate_limit=RateLimit(rate=20, burst=1)),
+    })
+
+    async def run():
+        start = time.monotonic()
+        await asyncio.gather(*[
+            scheduler.request("http://slow.test/", make_send()) for _ in range(5)
+        ])
+        slow = time.monotonic() - start
+
+        start = time.monotonic()
+        await asyncio.gather(*[
+            scheduler.request("http://fast.test/", make_send()) for _ in range(5)
+        ])
+        fast = time.monotonic() - start
+        return slow, fast
+
+    slow, fast = asyncio.run(run())
+    assert slow >= 0.18
+    assert fast < 0.1
+    assert scheduler.metrics()["slow.test"].rate == 20
+    assert scheduler.metrics()["fast.test"].rate is None
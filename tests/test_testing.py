@@ -0,0 +1,91 @@
+import asyncio
+
+import httpx
+
+from opynsearch.atom import parse_atom_feed
+from opynsearch.osdd11 import parse_osdd11
+from opynsearch.paging import PageSizeTuner, paginate
+from opynsearch.policy import RequestPolicy, RetryPolicy
+from opynsearch.scheduler import Scheduler
+from opynsearch.testing import MockServer, constant, run_load
+from opynsearch.testing.memory import retained_memory
+from opynsearch.utils import InternTable
+
+
+def test_description():
+    async def run():
+        async with MockServer(max_count=50) as server:
+            async with httpx.AsyncClient() as client:
+                response = await client.get(f"{server.url}/description.xml")
+                return server, parse_osdd11(response.content)
+
+    server, description = asyncio.run(run())
+    assert description == server.description
+    tuner = PageSizeTuner.from_url(description.urls[0])
+    assert (tuner.minimum, tuner.maximum) == (1, 50)
+
+
+def test_search_pages():
+    async def run():
+        async with MockServer(total_results=95) as server:
+            async with httpx.AsyncClient() as client:
+                async def fetch(start_index, count):
+                    response = await client.get(
+                        f"{server.url}/search",
+                        params={"startIndex": start_index, "count": count},
+                    )
+                    return response.content
+
+                return [page async for page in paginate(fetch, count=20)]
+
+    pages = asyncio.run(run())
+    assert [page.start_index for page in pages] == [1, 21, 41, 61, 81]
+    assert pages[0].total_results == 95
+    assert len({item.id for page in pages for item in page.items}) == 95
+    assert pages[-1].next_page is None
+
+
+def test_search_terms_and_max_count():
+    server = MockServer(total_results=160, max_count=5)
+    page = parse_atom_feed(server.feed("wind", 1, 100))
+    assert page.total_results == 10
+    assert page.items_per_page == 5
+    assert all("wind" in item.title for item in page.items)
+    assert page.items[0].subjects[0] == "wind"
+    assert page.items[0].rights == "CC-BY-4.0"
+
+
+def test_error_injection():
+    async def run():
+        async with MockServer(error_rate=1.0, retry_after=1, latency=constant(0.01)) as server:
+            async with httpx.AsyncClient() as client:
+                return await client.get(f"{server.url}/search")
+
+    response = asyncio.run(run())
+    assert response.status_code == 503
+    assert response.headers["Retry-After"] == "1"
+
+
+def test_load():
+    async def run():
+        async with MockServer(error_rate=0.2, latency=constant(0.001)) as server:
+            return await run_load(
+                server.url, requests=100, concurrency=10,
+                scheduler=Scheduler(),
+                policy=RequestPolicy(retry=RetryPolicy(attempts=5, backoff=0.001)),
+            )
+
+    report = asyncio.run(run())
+    assert report.requests == 100
+    assert report.requests_per_second > 0
+    assert report.percentile(50) <= report.percentile(99)
+    assert report.bytes > 0
+
+
+def test_interning_reduces_retained_memory():
+    server = MockServer(total_results=500, summary_size=0)
+    feeds = [server.feed(None, start_index, 100) for start_index in range(1, 501, 100)]
+
+    plain = retained_memory(feeds)
+    interned = retained_memory(feeds, lambda: InternTable(tuples=True))
+    assert interned < plain * 0.8